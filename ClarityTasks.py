@@ -1,11 +1,48 @@
-import json, csv, os, datetime
-from dataclasses import dataclass, asdict
+import json, csv, os, re, sys, pickle, queue, threading, datetime
+from dataclasses import dataclass, field
+from enum import Enum
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 
+try:
+    import orjson  # optional: much faster (de)serialization of the task list
+except ImportError:
+    orjson = None
+
 # --------- Model ---------
 DATA_FILE = "tasks.json"
+CACHE_FILE = "tasks.pkl"  # binary copy of DATA_FILE for faster startup; JSON stays canonical
 DATE_FMT = "%Y-%m-%d"
+TIMESTAMP_FMT = DATE_FMT + " %H:%M:%S"
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")  # use with fullmatch()
+NO_DUE = sys.maxsize  # due-ordinal for tasks that can't be overdue/due today
+REFRESH_DELAY_MS = 120  # coalesce bursts of search/filter changes into one refresh
+BULK_UPDATE_ROWS = 200  # row inserts/deletes above which the tree is unmapped while updating
+SAVE_ERROR_POLL_MS = 500  # how often the UI checks for failed background saves
+EXPORT_BUFFER_SIZE = 1 << 20  # 1 MiB write buffer for CSV export
+
+def _parse_ymd(s: str) -> datetime.date | None:
+    """Parse a YYYY-MM-DD string without strptime; None if it isn't a valid date."""
+    if len(s) != 10 or s[4] != "-" or s[7] != "-":
+        return None
+    digits = s[0:4] + s[5:7] + s[8:10]
+    if not (digits.isascii() and digits.isdecimal()):
+        return None  # int() would also accept signs, spaces and non-ASCII digits
+    try:
+        return datetime.date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+    except ValueError:
+        return None
+
+def _now_str() -> str:
+    return datetime.datetime.now().strftime(TIMESTAMP_FMT)
+
+_UNSET = object()  # "not parsed yet" marker for Task._due_date
+
+class Status(str, Enum):
+    DONE = "Done"
+    OVERDUE = "Overdue"
+    DUE_TODAY = "Due Today"
+    PENDING = "Pending"
 
 @dataclass
 class Task:
@@ -13,34 +50,101 @@ class Task:
     done: bool = False
     priority: str = "Medium"  # Low, Medium, High
     due: str | None = None    # YYYY-MM-DD or None
-    created: str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    created: str = field(default_factory=_now_str)  # per instance, not once at import
+
+    # Caches live in slots, not fields: never saved, compared or shown in repr
+    __slots__ = ("__dict__", "_due_date", "_search_haystack")
+
+    def __post_init__(self):
+        self.touch()
+
+    @property
+    def due_date(self) -> datetime.date | None:
+        """Parsed `due`, computed on first access; None if missing or invalid."""
+        if self._due_date is _UNSET:
+            self._due_date = _parse_ymd(self.due) if self.due else None
+        return self._due_date
+
+    @property
+    def search_haystack(self) -> str:
+        """Lowercased searchable text, built on first access."""
+        if self._search_haystack is None:
+            self._search_haystack = f"{self.title} {self.priority} {self.due or ''}".lower()
+        return self._search_haystack
+
+    def touch(self) -> None:
+        """Drop cached values; call after changing title, priority or due."""
+        self._due_date = _UNSET
+        self._search_haystack = None
+
+    def status(self, today: datetime.date | None = None) -> Status:
+        """Row status; pass `today` when checking many tasks so the clock is read once."""
+        if self.done:
+            return Status.DONE
+        d = self.due_date
+        if d is None:
+            return Status.PENDING
+        today = today or datetime.date.today()
+        if d < today:
+            return Status.OVERDUE
+        if d == today:
+            return Status.DUE_TODAY
+        return Status.PENDING
+
+    def is_overdue(self, today: datetime.date | None = None) -> bool:
+        return self.status(today) is Status.OVERDUE
+
+    def is_due_today(self, today: datetime.date | None = None) -> bool:
+        return self.status(today) is Status.DUE_TODAY
 
-    def is_overdue(self) -> bool:
-        if self.done or not self.due:
-            return False
-        try:
-            d = datetime.datetime.strptime(self.due, DATE_FMT).date()
-            return d < datetime.date.today()
-        except ValueError:
-            return False
 
-    def is_due_today(self) -> bool:
-        if self.done or not self.due:
-            return False
-        try:
-            d = datetime.datetime.strptime(self.due, DATE_FMT).date()
-            return d == datetime.date.today()
-        except ValueError:
-            return False
+# --------- Storage ---------
+TASK_FIELDS = ("title", "done", "priority", "due", "created")
 
+def _task_rows(tasks: list[Task]) -> list[tuple]:
+    """Field tuples in TASK_FIELDS order: the snapshot a save writes from."""
+    return [(t.title, t.done, t.priority, t.due, t.created) for t in tasks]
+
+def _source_key(st: os.stat_result) -> tuple[int, int]:
+    """Identifies the DATA_FILE contents a cache was built from."""
+    return st.st_mtime_ns, st.st_size
+
+def _load_cache() -> list[Task] | None:
+    """Tasks from CACHE_FILE if it was built from the current DATA_FILE, else None."""
+    try:
+        with open(CACHE_FILE, "rb") as f:
+            key, rows = pickle.load(f)
+        # Exact match, not "newer than": a restored backup or a coarse-mtime
+        # filesystem must never make an old cache look current
+        if key != _source_key(os.stat(DATA_FILE)):
+            return None
+        return [Task(*row) for row in rows]
+    except Exception:
+        return None  # missing, stale or unreadable: fall back to JSON
+
+def _write_cache(rows: list[tuple], key: tuple[int, int]) -> None:
+    # Plain tuples rather than Task objects, so the cache doesn't depend on the
+    # module path the app was started from (__main__ vs. ClarityTasks)
+    try:
+        with open(CACHE_FILE, "wb") as f:
+            pickle.dump((key, rows), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # the cache is only an accelerator
 
-# --------- Storage ---------
 def load_tasks() -> list[Task]:
     if not os.path.exists(DATA_FILE):
         return []
+    cached = _load_cache()
+    if cached is not None:
+        return cached
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        key = _source_key(os.stat(DATA_FILE))  # before reading, so the key can't be newer than the data
+        if orjson is not None:
+            with open(DATA_FILE, "rb") as f:
+                raw = orjson.loads(f.read())
+        else:
+            with open(DATA_FILE, "r", encoding="utf-8") as f:
+                raw = json.load(f)
         tasks = []
         for item in raw:
             # Backward compatibility & validation
@@ -49,19 +153,49 @@ def load_tasks() -> list[Task]:
                 done=bool(item.get("done", False)),
                 priority=item.get("priority", "Medium"),
                 due=item.get("due"),
-                created=item.get("created", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                created=item.get("created") or _now_str(),
             ))
+        _write_cache(_task_rows(tasks), key)
         return tasks
     except Exception as e:
         messagebox.showerror("Load Error", f"Failed to read {DATA_FILE}:\n{e}")
         return []
 
+def _write_rows(rows: list[tuple]) -> None:
+    """Write DATA_FILE and CACHE_FILE from the same snapshot of field tuples."""
+    records = [dict(zip(TASK_FIELDS, row)) for row in rows]
+    # Both paths produce the same bytes: compact separators and raw UTF-8
+    if orjson is not None:
+        data = orjson.dumps(records)
+    else:
+        # dumps() rather than dump(): only the one-shot path uses the C encoder;
+        # one encode() and a binary write skip TextIOWrapper
+        data = json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # Write a temp file and swap it in, so an interrupted save (e.g. the worker
+    # thread dying at exit) never leaves DATA_FILE truncated. The name is fixed,
+    # so a leftover from such an exit is simply overwritten by the next save.
+    tmp = DATA_FILE + ".tmp"
+    with open(tmp, "wb") as f:  # regular open(): the umask applies
+        f.write(data)
+    try:
+        os.chmod(tmp, os.stat(DATA_FILE).st_mode & 0o7777)  # keep the user's permissions
+    except FileNotFoundError:
+        pass
+    key = _source_key(os.stat(tmp))  # rename keeps mtime and size
+    os.replace(tmp, DATA_FILE)
+    _write_cache(rows, key)  # keep the cache in step with every save
+
+def _write_tasks(tasks: list[Task]) -> None:
+    _write_rows(_task_rows(tasks))
+
+def _show_save_error(e: Exception) -> None:
+    messagebox.showerror("Save Error", f"Failed to write {DATA_FILE}:\n{e}")
+
 def save_tasks(tasks: list[Task]) -> None:
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump([asdict(t) for t in tasks], f, indent=2, ensure_ascii=False)
+        _write_tasks(tasks)
     except Exception as e:
-        messagebox.showerror("Save Error", f"Failed to write {DATA_FILE}:\n{e}")
+        _show_save_error(e)
 
 
 # --------- Controller / UI ---------
@@ -71,16 +205,28 @@ class TodoApp(ttk.Frame):
         self.master: tk.Tk = master
         self.tasks: list[Task] = load_tasks()
         self.filtered_indices: list[int] = []  # map view rows -> self.tasks index
+        self._current_rows: dict[str, tuple] = {}  # iid -> values currently shown
+        self._row_index: dict[str, int] = {}  # iid -> self.tasks index
+        self._rebuild_indexes()
         self.search_var = tk.StringVar()
         self.filter_var = tk.StringVar(value="All")
         self.title_var = tk.StringVar()
         self.priority_var = tk.StringVar(value="Medium")
         self.due_var = tk.StringVar()
+        self._pending_refresh = None  # after() id of a scheduled refresh
+
+        # Saves run on a worker; the queue holds at most the latest snapshot
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._save_errors: queue.SimpleQueue = queue.SimpleQueue()  # reported by the main thread
+        self._saver = threading.Thread(target=self._save_worker, daemon=True)
+        self._saver.start()
 
         self._build_style()
         self._build_ui()
         self._bind_shortcuts()
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
         self.refresh_view()  # initial populate
+        self._poll_save_errors()
 
     # ---- UI Pieces ----
     def _build_style(self):
@@ -146,6 +292,7 @@ class TodoApp(ttk.Frame):
         ttk.Label(ctrl_row, text="Search").grid(row=0, column=0, sticky="w")
         search = ttk.Entry(ctrl_row, textvariable=self.search_var)
         search.grid(row=1, column=0, padx=(0, 8), sticky="we")
+        self._search_entry = search
 
         ttk.Label(ctrl_row, text="Filter").grid(row=0, column=1, sticky="w")
         filt = ttk.Combobox(
@@ -179,7 +326,7 @@ class TodoApp(ttk.Frame):
         self.tree.column("status", width=110, anchor="center")
         self.tree.pack(side="left", fill="both", expand=True)
 
-        vsb = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self._vsb = vsb = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
         self.tree.configure(yscrollcommand=vsb.set)
         vsb.pack(side="right", fill="y")
 
@@ -190,8 +337,10 @@ class TodoApp(ttk.Frame):
         self.count_label.pack(side="left")
 
         # Events
-        self.search_var.trace_add("write", lambda *_: self.refresh_view())
-        self.filter_var.trace_add("write", lambda *_: self.refresh_view())
+        # Refresh on user input only; programmatic set() calls don't trigger it
+        search.bind("<KeyRelease>", self._schedule_refresh)
+        search.bind("<<PasteSelection>>", self._schedule_refresh)  # X11 middle-click paste
+        filt.bind("<<ComboboxSelected>>", self._schedule_refresh)
         self.tree.bind("<Double-1>", lambda e: self.edit_selected())
         self.tree.bind("<Button-3>", self._context_menu)
 
@@ -204,12 +353,8 @@ class TodoApp(ttk.Frame):
 
     # ---- Actions ----
     def _focus_search(self):
-        for w in self.master.winfo_children():
-            for child in w.winfo_children():
-                if isinstance(child, ttk.Entry) and child is not None and child.cget("textvariable") == str(self.search_var):
-                    child.focus_set()
-                    child.selection_range(0, tk.END)
-                    return
+        self._search_entry.focus_set()
+        self._search_entry.selection_range(0, tk.END)
 
     def _context_menu(self, event):
         iid = self.tree.identify_row(event.y)
@@ -235,10 +380,11 @@ class TodoApp(ttk.Frame):
             return
 
         self.tasks.append(Task(title=title, priority=prio, due=due))
-        save_tasks(self.tasks)
+        self._enqueue_save()
         self.title_var.set("")
         self.due_var.set("")
         self.priority_var.set("Medium")
+        self._rebuild_indexes()
         self.refresh_view()
 
     def edit_selected(self):
@@ -269,7 +415,9 @@ class TodoApp(ttk.Frame):
             return
 
         t.title, t.priority, t.due = new_title, new_prio, new_due
-        save_tasks(self.tasks)
+        t.touch()
+        self._enqueue_save()
+        self._rebuild_indexes()
         self.refresh_view()
 
     def toggle_selected(self):
@@ -277,7 +425,8 @@ class TodoApp(ttk.Frame):
         if idx is None:
             return
         self.tasks[idx].done = not self.tasks[idx].done
-        save_tasks(self.tasks)
+        self._enqueue_save()
+        self._rebuild_indexes()
         self.refresh_view()
 
     def delete_selected(self):
@@ -287,14 +436,16 @@ class TodoApp(ttk.Frame):
         title = self.tasks[idx].title
         if messagebox.askyesno("Delete", f"Delete task:\n\n{title}"):
             self.tasks.pop(idx)
-            save_tasks(self.tasks)
+            self._enqueue_save()
+            self._rebuild_indexes()
             self.refresh_view()
 
     def clear_completed(self):
         before = len(self.tasks)
         self.tasks = [t for t in self.tasks if not t.done]
         if len(self.tasks) != before:
-            save_tasks(self.tasks)
+            self._enqueue_save()
+            self._rebuild_indexes()
             self.refresh_view()
 
     def export_csv(self):
@@ -308,19 +459,54 @@ class TodoApp(ttk.Frame):
         if not path:
             return
         try:
-            with open(path, "w", encoding="utf-8", newline="") as f:
+            with open(path, "w", encoding="utf-8", newline="", buffering=EXPORT_BUFFER_SIZE) as f:
                 w = csv.writer(f)
                 w.writerow(["Title", "Done", "Priority", "Due", "Created"])
-                for t in self.tasks:
-                    w.writerow([t.title, "Yes" if t.done else "No", t.priority, t.due or "", t.created])
+                w.writerows((t.title, "Yes" if t.done else "No", t.priority, t.due or "", t.created) for t in self.tasks)
             messagebox.showinfo("Exported", f"Saved to:\n{path}")
         except Exception as e:
             messagebox.showerror("Export Error", str(e))
 
+    # ---- Persistence ----
+    def _enqueue_save(self):
+        try:
+            self._save_queue.get_nowait()  # a newer snapshot supersedes it
+        except queue.Empty:
+            pass
+        # Field tuples taken here on the main thread: later edits to the live Task
+        # objects can't leak into a save that is already queued or in progress
+        self._save_queue.put(_task_rows(self.tasks))
+
+    def _save_worker(self):
+        while True:
+            rows = self._save_queue.get()
+            if rows is None:
+                return
+            try:
+                _write_rows(rows)
+            except Exception as e:
+                self._save_errors.put(e)  # no Tk calls off the main thread
+
+    def _poll_save_errors(self):
+        while not self._save_errors.empty():
+            _show_save_error(self._save_errors.get())
+        self._save_error_job = self.master.after(SAVE_ERROR_POLL_MS, self._poll_save_errors)
+
+    def _on_close(self):
+        self.master.after_cancel(self._save_error_job)
+        self._save_queue.put(None)  # blocks until a pending save has been picked up
+        self._saver.join()  # let the last write finish before exiting
+        while not self._save_errors.empty():
+            _show_save_error(self._save_errors.get())
+        self.master.destroy()
+
     # ---- Helpers ----
     def _valid_date(self, s: str) -> bool:
+        m = _DATE_RE.fullmatch(s)
+        if not m:
+            return False
         try:
-            datetime.datetime.strptime(s, DATE_FMT)
+            datetime.date(int(m[1]), int(m[2]), int(m[3]))  # catches e.g. Feb 30
             return True
         except ValueError:
             return False
@@ -329,57 +515,90 @@ class TodoApp(ttk.Frame):
         sel = self.tree.selection()
         if not sel:
             return None
-        view_row = int(sel[0])
-        if view_row < 0 or view_row >= len(self.filtered_indices):
-            return None
-        return self.filtered_indices[view_row]
-
-    def _matches_filter(self, t: Task) -> bool:
-        f = self.filter_var.get()
-        if f == "All":
-            return True
-        if f == "Active":
-            return not t.done
-        if f == "Completed":
-            return t.done
-        if f == "Due Today":
-            return t.is_due_today()
-        if f == "Overdue":
-            return t.is_overdue()
-        if f == "High Priority":
-            return t.priority == "High" and not t.done
-        return True
-
-    def _matches_search(self, t: Task) -> bool:
-        q = self.search_var.get().strip().lower()
-        if not q:
-            return True
-        hay = f"{t.title} {t.priority} {t.due or ''}".lower()
-        return q in hay
+        return self._row_index.get(sel[0])
+
+    def _rebuild_indexes(self):
+        """Precompute the task indices for each filter; call after any mutation."""
+        tasks = self.tasks
+        # Only open tasks get a real ordinal, so Overdue/Due Today need no done check
+        self._col_due = [NO_DUE if t.done or t.due_date is None else t.due_date.toordinal() for t in tasks]
+        self._by_filter: dict[str, list[int]] = {
+            "All": list(range(len(tasks))),
+            "Active": [i for i, t in enumerate(tasks) if not t.done],
+            "Completed": [i for i, t in enumerate(tasks) if t.done],
+            "High Priority": [i for i, t in enumerate(tasks) if t.priority == "High" and not t.done],
+        }
+        self._today_cache = None  # date-based buckets are filled in by _filter_candidates
+
+    def _filter_candidates(self, today: datetime.date) -> list[int]:
+        """Indices passing the current filter, from the precomputed buckets."""
+        if self._today_cache != today:
+            # Due Today/Overdue depend on the date, so refill them once per day
+            o = today.toordinal()
+            self._by_filter["Due Today"] = [i for i, d in enumerate(self._col_due) if d == o]
+            self._by_filter["Overdue"] = [i for i, d in enumerate(self._col_due) if d < o]
+            self._today_cache = today
+        return self._by_filter.get(self.filter_var.get(), self._by_filter["All"])
+
+    def _matches_search(self, t: Task, q: str) -> bool:
+        return not q or q in t.search_haystack
+
+    def _schedule_refresh(self, *_):
+        if self._pending_refresh is not None:
+            self.master.after_cancel(self._pending_refresh)
+        self._pending_refresh = self.master.after(REFRESH_DELAY_MS, self._do_refresh)
+
+    def _do_refresh(self):
+        self._pending_refresh = None
+        self.refresh_view()
 
     def refresh_view(self):
-        # Clear
-        for iid in self.tree.get_children():
-            self.tree.delete(iid)
+        today = datetime.date.today()  # once per refresh, not per status check
+        q = self.search_var.get().strip().lower()
 
         # Build filtered index map
-        self.filtered_indices.clear()
-        for i, t in enumerate(self.tasks):
-            if self._matches_filter(t) and self._matches_search(t):
-                self.filtered_indices.append(i)
-
-        # Insert rows
-        for row_idx, i in enumerate(self.filtered_indices):
+        candidates = self._filter_candidates(today)
+        if q:
+            tasks, matches_search = self.tasks, self._matches_search
+            self.filtered_indices = [i for i in candidates if matches_search(tasks[i], q)]
+        else:
+            self.filtered_indices = list(candidates)  # copy: the buckets are reused
+
+        # Desired rows, keyed by a per-task iid so unchanged rows (and the selection) survive
+        desired: dict[str, tuple] = {}
+        self._row_index = {}
+        for i in self.filtered_indices:
             t = self.tasks[i]
-            status = "Done" if t.done else ("Overdue" if t.is_overdue() else ("Due Today" if t.is_due_today() else "Pending"))
-            values = (t.title, t.priority, t.due or "", status)
-            self.tree.insert("", "end", iid=str(row_idx), values=values)
+            iid = str(id(t))
+            desired[iid] = (t.title, t.priority, t.due or "", t.status(today).value)
+            self._row_index[iid] = i
+
+        # Apply only the difference to the Treeview
+        current = self._current_rows
+        removed = current.keys() - desired.keys()
+        # Big batches (first load, clearing a search) go in with the tree unmapped,
+        # so Tk lays it out once instead of after every row
+        added = len(desired) - (len(current) - len(removed))
+        bulk = len(removed) + added >= BULK_UPDATE_ROWS
+        if bulk:
+            self.tree.pack_forget()
+        for iid in removed:
+            self.tree.delete(iid)
+        # Task order never changes, so surviving rows are already in place
+        for pos, (iid, values) in enumerate(desired.items()):
+            old_values = current.get(iid)
+            if old_values is None:
+                self.tree.insert("", pos, iid=iid, values=values)
+            elif old_values != values:
+                self.tree.item(iid, values=values)
+        if bulk:
+            self.tree.pack(side="left", fill="both", expand=True, before=self._vsb)
+        self._current_rows = desired
 
         # Status bar
         active = sum(1 for t in self.tasks if not t.done)
         self.count_label.config(text=f"{active} task(s) remaining — {len(self.tasks)} total")
-        # Persist view changes (order isn't changed here, but if you add sorting later, save)
-        save_tasks(self.tasks)
+        # No save here: refresh only changes the view, and every mutation already persists.
 
 
 # --------- Run ---------
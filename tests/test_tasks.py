@@ -1,10 +1,306 @@
+import datetime
+import os
+import tempfile
 import unittest
-from ClarityTasks import Task
+from unittest import mock
+
+import ClarityTasks
+from ClarityTasks import Status, Task, TodoApp, _parse_ymd, load_tasks, save_tasks
 
 class TestTask(unittest.TestCase):
     def test_overdue(self):
         t = Task(title="Demo", done=False, due="2000-01-01")
         self.assertTrue(t.is_overdue())
 
+    def test_due_today_with_explicit_today(self):
+        today = datetime.date(2025, 9, 4)
+        t = Task(title="Demo", due="2025-09-04")
+        self.assertTrue(t.is_due_today(today))
+        self.assertFalse(t.is_overdue(today))
+        self.assertTrue(t.is_overdue(today + datetime.timedelta(days=1)))
+
+    def test_status(self):
+        today = datetime.date(2025, 9, 4)
+        self.assertIs(Task(title="a", done=True, due="2000-01-01").status(today), Status.DONE)
+        self.assertIs(Task(title="b", due="2025-09-03").status(today), Status.OVERDUE)
+        self.assertIs(Task(title="c", due="2025-09-04").status(today), Status.DUE_TODAY)
+        self.assertIs(Task(title="d", due="2025-09-05").status(today), Status.PENDING)
+        self.assertIs(Task(title="e", due="bogus").status(today), Status.PENDING)
+
+    def test_status_uses_given_today(self):
+        t = Task(title="Demo", due="2025-09-04")
+        t.due_date  # parse before date.today is patched out
+        with mock.patch.object(datetime, "date") as fake_date:
+            fake_date.today.side_effect = AssertionError("today() should not be called")
+            self.assertIs(t.status(datetime.datetime(2025, 9, 4).date()), Status.DUE_TODAY)
+
+    def test_due_date_cached_until_touch(self):
+        t = Task(title="Demo", due="2025-09-04")
+        self.assertEqual(t.due_date, datetime.date(2025, 9, 4))
+        t.due = "2025-09-05"
+        self.assertEqual(t.due_date, datetime.date(2025, 9, 4))
+        t.touch()
+        self.assertEqual(t.due_date, datetime.date(2025, 9, 5))
+
+    def test_search_haystack_cached_until_touch(self):
+        t = Task(title="Buy MILK", priority="High", due="2025-09-04")
+        self.assertEqual(t.search_haystack, "buy milk high 2025-09-04")
+        t.title = "Call mom"
+        t.touch()
+        self.assertIn("call mom", t.search_haystack)
+
+class TestParseYmd(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(_parse_ymd("2025-09-04"), datetime.date(2025, 9, 4))
+
+    def test_invalid(self):
+        for s in ("", "2025-9-4", "2025/09/04", "2025-02-30", "abcd-ef-gh",
+                  "2025-+9-04", " 202-09-04", "２０２５-09-04"):
+            self.assertIsNone(_parse_ymd(s))
+
+class FakeTree:
+    """Just enough of ttk.Treeview for refresh_view: row order, values and selection."""
+    def __init__(self):
+        self.order: list[str] = []
+        self.values: dict[str, tuple] = {}
+        self.selected: tuple = ()
+        self.calls = {"insert": 0, "delete": 0, "item": 0}
+
+    def insert(self, parent, index, iid, values):
+        self.calls["insert"] += 1
+        self.order.insert(index, iid)
+        self.values[iid] = values
+
+    def delete(self, iid):
+        self.calls["delete"] += 1
+        self.order.remove(iid)
+        del self.values[iid]
+        self.selected = tuple(s for s in self.selected if s != iid)
+
+    def item(self, iid, values):
+        self.calls["item"] += 1
+        self.values[iid] = values
+
+    def selection(self):
+        return self.selected
+
+    def pack_forget(self):
+        pass
+
+    def pack(self, **kw):
+        pass
+
+    def shown_titles(self):
+        return [self.values[iid][0] for iid in self.order]
+
+class TestRefreshView(unittest.TestCase):
+    def make_app(self, tasks):
+        # TodoApp without a Tk root: only what refresh_view touches
+        app = TodoApp.__new__(TodoApp)
+        app.tasks = tasks
+        app.search_var = mock.Mock(get=mock.Mock(return_value=""))
+        app.filter_var = mock.Mock(get=mock.Mock(return_value="All"))
+        app.tree = FakeTree()
+        app._vsb = mock.Mock()
+        app.count_label = mock.Mock()
+        app._current_rows = {}
+        app._row_index = {}
+        app._rebuild_indexes()
+        return app
+
+    def test_reads_today_once_per_refresh(self):
+        today = datetime.date.today().isoformat()
+        app = self.make_app([Task(title=str(i), due=today if i % 2 else "2000-01-01") for i in range(10)])
+        with mock.patch.object(datetime, "date", wraps=datetime.date) as fake_date:
+            app.refresh_view()
+        self.assertEqual(fake_date.today.call_count, 1)
+        statuses = {values[3] for values in app.tree.values.values()}
+        self.assertEqual(statuses, {"Due Today", "Overdue"})
+
+    def test_rows_follow_filter_and_search(self):
+        app = self.make_app([
+            Task(title="alpha"), Task(title="beta", done=True), Task(title="gamma"),
+            Task(title="delta", done=True), Task(title="alphabet"),
+        ])
+        app.refresh_view()
+        self.assertEqual(app.tree.shown_titles(), ["alpha", "beta", "gamma", "delta", "alphabet"])
+
+        app.filter_var.get.return_value = "Completed"
+        app.refresh_view()
+        self.assertEqual(app.tree.shown_titles(), ["beta", "delta"])
+
+        # Rows reappearing between surviving ones must land in task order
+        app.filter_var.get.return_value = "All"
+        app.refresh_view()
+        self.assertEqual(app.tree.shown_titles(), ["alpha", "beta", "gamma", "delta", "alphabet"])
+
+        app.search_var.get.return_value = "ALPHA "
+        app.refresh_view()
+        self.assertEqual(app.tree.shown_titles(), ["alpha", "alphabet"])
+
+        app.search_var.get.return_value = ""
+        app.tasks.pop(2)  # delete "gamma"
+        app._rebuild_indexes()
+        app.refresh_view()
+        self.assertEqual(app.tree.shown_titles(), ["alpha", "beta", "delta", "alphabet"])
+        self.assertEqual(app.tree.shown_titles(), [app.tasks[i].title for i in app.filtered_indices])
+
+    def test_changed_row_updated_in_place(self):
+        app = self.make_app([Task(title="one"), Task(title="two")])
+        app.refresh_view()
+        app.tree.calls = {"insert": 0, "delete": 0, "item": 0}
+        app.tasks[1].title = "two (edited)"
+        app.tasks[1].touch()
+        app._rebuild_indexes()
+        app.refresh_view()
+        self.assertEqual(app.tree.calls, {"insert": 0, "delete": 0, "item": 1})
+        self.assertEqual(app.tree.shown_titles(), ["one", "two (edited)"])
+
+    def test_selection_maps_to_task_after_filter_change(self):
+        app = self.make_app([Task(title="done", done=True), Task(title="open"), Task(title="open too")])
+        app.refresh_view()
+        app.tree.selected = (app.tree.order[2],)  # "open too"
+        self.assertEqual(app._selected_index(), 2)
+
+        app.filter_var.get.return_value = "Active"
+        app.refresh_view()
+        self.assertEqual(app.tree.order.index(app.tree.selected[0]), 1)  # row moved up
+        self.assertEqual(app._selected_index(), 2)  # still the same task
+
+        app.filter_var.get.return_value = "Completed"
+        app.refresh_view()
+        self.assertIsNone(app._selected_index())  # its row is gone
+
+    def candidates(self, app, name, today):
+        app.filter_var.get.return_value = name
+        return app._filter_candidates(today)
+
+    def test_filter_buckets(self):
+        today = datetime.date(2025, 9, 4)
+        app = self.make_app([
+            Task(title="late", due="2025-09-01"),
+            Task(title="late, done", done=True, due="2025-09-01"),
+            Task(title="today", priority="High", due="2025-09-04"),
+            Task(title="today, done", done=True, priority="High", due="2025-09-04"),
+            Task(title="later", due="2025-09-30"),
+            Task(title="no due", priority="Low"),
+        ])
+        self.assertEqual(self.candidates(app, "All", today), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(self.candidates(app, "Active", today), [0, 2, 4, 5])
+        self.assertEqual(self.candidates(app, "Completed", today), [1, 3])
+        self.assertEqual(self.candidates(app, "Overdue", today), [0])  # done and undated tasks left out
+        self.assertEqual(self.candidates(app, "Due Today", today), [2])
+        self.assertEqual(self.candidates(app, "High Priority", today), [2])
+        self.assertEqual(self.candidates(app, "No Such Filter", today), [0, 1, 2, 3, 4, 5])
+
+    def test_date_buckets_follow_today(self):
+        app = self.make_app([Task(title="a", due="2025-09-04"), Task(title="b", due="2025-09-05")])
+        self.assertEqual(self.candidates(app, "Due Today", datetime.date(2025, 9, 4)), [0])
+        self.assertEqual(self.candidates(app, "Overdue", datetime.date(2025, 9, 4)), [])
+        tomorrow = datetime.date(2025, 9, 5)  # date rolled over while the app was open
+        self.assertEqual(self.candidates(app, "Due Today", tomorrow), [1])
+        self.assertEqual(self.candidates(app, "Overdue", tomorrow), [0])
+
+    def test_buckets_rebuilt_after_mutation(self):
+        today = datetime.date(2025, 9, 4)
+        app = self.make_app([Task(title="a", due="2025-09-04")])
+        self.assertEqual(self.candidates(app, "Due Today", today), [0])
+        app.tasks[0].done = True
+        app._rebuild_indexes()
+        self.assertEqual(self.candidates(app, "Due Today", today), [])
+        self.assertEqual(self.candidates(app, "Completed", today), [0])
+
+class TestValidDate(unittest.TestCase):
+    def test_valid_date(self):
+        valid = TodoApp._valid_date  # doesn't touch self
+        self.assertTrue(valid(None, "2024-02-29"))
+        for s in ("2025-02-30", "2025-9-4", "2025/09/04", "2025-09-04 ", "2025-09-04\n", "soon"):
+            self.assertFalse(valid(None, s))
+
+class TestStorage(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_file = os.path.join(tmp.name, "tasks.json")
+        self.cache_file = os.path.join(tmp.name, "tasks.pkl")
+        for name, path in (("DATA_FILE", self.data_file), ("CACHE_FILE", self.cache_file)):
+            patcher = mock.patch.object(ClarityTasks, name, path)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        tasks = [
+            Task(title="Café ☕", priority="High", due="2025-09-04"),
+            Task(title="Done", done=True),
+        ]
+        tasks[0].due_date  # populate the cache; it must not be persisted
+        save_tasks(tasks)
+        self.assertEqual(load_tasks(), tasks)
+
+    @unittest.skipIf(ClarityTasks.orjson is None, "orjson not installed")
+    def test_same_file_with_and_without_orjson(self):
+        tasks = [Task(title="Café ☕ \"quoted\"", due="2025-09-04"), Task(title="Done", done=True)]
+        save_tasks(tasks)
+        with open(self.data_file, "rb") as f:
+            with_orjson = f.read()
+        with mock.patch.object(ClarityTasks, "orjson", None):
+            save_tasks(tasks)
+        with open(self.data_file, "rb") as f:
+            self.assertEqual(f.read(), with_orjson)
+
+    def test_failed_save_keeps_previous_file(self):
+        save_tasks([Task(title="Keep me")])
+        with mock.patch.object(ClarityTasks.os, "replace", side_effect=OSError("disk gone")):
+            with self.assertRaises(OSError):
+                ClarityTasks._write_tasks([Task(title="Lost")])
+        self.assertEqual([t.title for t in load_tasks()], ["Keep me"])
+        save_tasks([Task(title="Next")])  # reuses the leftover temp file
+        self.assertFalse(os.path.exists(self.data_file + ".tmp"))
+
+    @unittest.skipIf(os.name != "posix", "POSIX permissions")
+    def test_save_file_mode(self):
+        old_umask = os.umask(0o022)
+        self.addCleanup(os.umask, old_umask)
+        save_tasks([Task(title="New file")])
+        self.assertEqual(os.stat(self.data_file).st_mode & 0o777, 0o644)
+        os.chmod(self.data_file, 0o640)
+        save_tasks([Task(title="Existing file")])
+        self.assertEqual(os.stat(self.data_file).st_mode & 0o777, 0o640)
+
+    def test_json_and_cache_written_from_one_snapshot(self):
+        t = Task(title="Before")
+        rows = ClarityTasks._task_rows([t])
+        t.title, t.done = "Edited meanwhile", True
+        ClarityTasks._write_rows(rows)
+        from_cache = load_tasks()
+        with mock.patch.object(ClarityTasks, "_load_cache", return_value=None):
+            from_json = load_tasks()
+        self.assertEqual([(x.title, x.done) for x in from_cache], [("Before", False)])
+        self.assertEqual(from_cache, from_json)
+
+    def test_cache_used_when_fresh(self):
+        tasks = [Task(title="One", due="2025-09-04")]
+        save_tasks(tasks)
+        self.assertTrue(os.path.exists(self.cache_file))
+        with mock.patch.object(ClarityTasks.json, "load") as json_load, \
+             mock.patch.object(ClarityTasks, "orjson", None):
+            self.assertEqual(load_tasks(), tasks)
+        json_load.assert_not_called()
+
+    def test_save_then_load_sees_latest(self):
+        save_tasks([Task(title="Old")])
+        self.assertEqual([t.title for t in load_tasks()], ["Old"])
+        save_tasks([Task(title="New")])
+        self.assertEqual([t.title for t in load_tasks()], ["New"])
+
+    def test_restored_backup_with_old_mtime_ignored(self):
+        save_tasks([Task(title="Current")])
+        st = os.stat(self.data_file)
+        # Replace the JSON behind the app's back, preserving the old mtime (cp -p)
+        with open(self.data_file, "w", encoding="utf-8") as f:
+            f.write('[{"title": "Restored from backup"}]')
+        os.utime(self.data_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertEqual([t.title for t in load_tasks()], ["Restored from backup"])
+
 if __name__ == "__main__":
     unittest.main()